@@ -19,6 +19,8 @@ All about inheritance and creating subclasses
 
 # Previous class...
 import random
+import sys
+import tracemalloc
 
 
 class Employees:
@@ -203,3 +205,222 @@ print(managerMolly.remove_emp(testDev))
 managerMolly.print_employees()
 
 # All successes! Woohoo!
+
+
+# BONUS: What happens when the company hires A LOT of developers?
+
+# Every DeveloperV2 stores its own name_last, name_first and programming_lang strings, plus an email that was built with
+# an f-string in __init__. And every time we call review_signoff_request(), another f-string is built from scratch.
+# With millions of employees, most of those strings repeat ("Python", "Java", "John", "Smith"...), so we keep paying
+# for copies of the same text over and over.
+
+# The fix is a design pattern called a FLYWEIGHT: we keep every distinct string ONCE in a shared table (a class
+# variable, just like raise_amount from Lesson 2!), and each instance only keeps a small integer "code" that points into
+# that table. The strings are rebuilt only when someone actually reads them.
+
+# VOCAB:
+# Interning: Storing only one copy of each distinct value and handing out that same copy to everyone who asks for it.
+
+
+class StringTable:
+    # Both of these are class variables, so they are shared by EVERY instance of every class that uses the table
+    strings = []  # code --> string (the code is just the string's position in the list)
+    codes = {}  # string --> code
+
+    @classmethod
+    def code_for(cls, string):
+        code = cls.codes.get(string)
+
+        if code is None:  # First time we see this string, so we give it the next free code
+            code = len(cls.strings)
+            cls.strings.append(string)
+            cls.codes[string] = code
+
+        # Since we return the int stored in the dictionary, every instance with the same string shares the same code
+        return code
+
+    @classmethod
+    def string_for(cls, code):
+        return cls.strings[code]
+
+
+class FlyweightDeveloper(DeveloperV2):
+    # The sign-off messages are also cached in a class variable, so a repeated name only builds each message once.
+    # It's a pair of dictionaries (one for "will not", one for "will"), each going first name code --> {last name code
+    # --> message}. We nest dictionaries instead of using a (first, last, answer) tuple as the key, because building
+    # that tuple would allocate a new object on every single call.
+    signoff_messages = ({}, {})
+
+    # Until someone assigns an email by hand, there's no email code, so the email is built from the names. This is a
+    # class variable (Lesson 2!), so it costs nothing per instance until it's changed.
+    email_code = None
+
+    def __init__(self, name_last, name_first, monthly_pay, programming_lang: str):
+        # We don't call super().__init__() this time, since Employees.__init__ would build a brand-new email string for
+        # every instance (and, through the email setter below, put it in the StringTable)--exactly what we're trying to
+        # avoid. Instead, we only store the codes and the pay.
+        # CAREFUL: this means we copied monthly_pay and salary from Employees.__init__ by hand. If someone later adds a
+        # new attribute to Employees.__init__, FlyweightDeveloper will NOT get it unless we copy it here too. That's
+        # exactly the headache super() saves us from, so skipping it should be the exception, not the rule.
+        self.name_last_code = StringTable.code_for(name_last)
+        self.name_first_code = StringTable.code_for(name_first)
+        self.programming_lang_code = StringTable.code_for(programming_lang)
+        self.monthly_pay = monthly_pay
+        self.salary = float(monthly_pay * 12)
+
+    # To make the codes look like the old attributes from the outside, we use the @property decorator. It turns a
+    # method into something we read like an attribute (developer.name_last, without brackets), so the rest of the
+    # code--like Manager.add_emp()--never has to know about the codes.
+    # A property on its own is read-only, though, and a DeveloperV2 lets us write developer.name_last = "C". So we also
+    # add a SETTER (@name_last.setter), which runs whenever we assign to the property, and turns the new value into a
+    # code.
+    @property
+    def name_last(self):
+        return StringTable.string_for(self.name_last_code)
+
+    @name_last.setter
+    def name_last(self, value):
+        self.name_last_code = StringTable.code_for(value)
+
+    @property
+    def name_first(self):
+        return StringTable.string_for(self.name_first_code)
+
+    @name_first.setter
+    def name_first(self, value):
+        self.name_first_code = StringTable.code_for(value)
+
+    @property
+    def programming_lang(self):
+        return StringTable.string_for(self.programming_lang_code)
+
+    @programming_lang.setter
+    def programming_lang(self, value):
+        self.programming_lang_code = StringTable.code_for(value)
+
+    # The email isn't stored anywhere--unless it was assigned by hand, it's rebuilt from the names EVERY time we read
+    # it. That is a small difference from DeveloperV2, whose email is fixed when the object is built: if a DeveloperV2
+    # changes its name_last, its email keeps the old name, while a FlyweightDeveloper's email follows the new name.
+    @property
+    def email(self):
+        if self.email_code is None:
+            return f"{self.name_first + self.name_last}@company.com"
+        else:
+            return StringTable.string_for(self.email_code)
+
+    # We still allow developer.email = "...", like DeveloperV2 does. The new email goes into the StringTable, and from
+    # then on it stays put, even if the names change.
+    @email.setter
+    def email(self, value):
+        self.email_code = StringTable.code_for(value)
+
+    def review_signoff_request(self):
+
+        percent_signoff = random.randrange(0, 2)
+
+        messages_for_first = FlyweightDeveloper.signoff_messages[percent_signoff].get(self.name_first_code)
+        if messages_for_first is None:
+            messages_for_first = {}
+            FlyweightDeveloper.signoff_messages[percent_signoff][self.name_first_code] = messages_for_first
+
+        message = messages_for_first.get(self.name_last_code)
+
+        if message is None:
+            if percent_signoff == 0:
+                message = f"{self.name_first} {self.name_last} will not sign off on this."
+            else:
+                message = f"{self.name_first} {self.name_last} will sign off on this."
+
+            messages_for_first[self.name_last_code] = message
+
+        return message
+
+
+# Let's check that a FlyweightDeveloper behaves like a DeveloperV2 (apart from the email difference above):
+
+flyDev = FlyweightDeveloper("Dev", "Fly", 9225, "Python")
+print(f"\n{flyDev.name_last}, {flyDev.name_first}, {flyDev.email}, {flyDev.programming_lang}")  # Dev, Fly,
+# FlyDev@company.com, Python
+print(flyDev.review_signoff_request())
+print(managerMolly.add_emp(flyDev))  # Manager works with it too, since name_last and name_first still "exist"
+flyDev.name_first = "Flying"  # Thanks to the setter, we can still change the name
+print(f"{flyDev.name_first}, {flyDev.email}")  # Flying, FlyingDev@company.com
+flyDev.email = "TheFlyingDev@company.com"  # And, thanks to the email setter, we can still pick our own email
+print(flyDev.email)  # TheFlyingDev@company.com
+# (Fun fact: instances of the same class share one list of attribute names, to save memory. Since flyDev now has an
+# email_code, EVERY FlyweightDeveloper reserves a spot for one--about 16 bytes each--which shows up in the numbers below.)
+
+# And now, let's MEASURE the difference. tracemalloc is a module that comes with Python and keeps track of the memory
+# that Python allocates. We build the same staff with both classes from "Last/First/Pay/Language" strings (like the
+# from_slashed_str alternative constructor from Lesson 3, so every name starts out as a fresh string, just like it would
+# coming from a file), and then ask every employee for a sign-off.
+
+# We look at three different things:
+# Retained memory: How much memory is still in use AFTER the work is done (the objects we kept around).
+# Peak extra memory per developer built: The most memory that was in use at any ONE moment while building a developer,
+# on top of what was already there. tracemalloc.reset_peak() lets us measure this for each call. Careful: a peak is NOT
+# everything the call allocated. If a temporary string is freed before the next one is made (like the name_first +
+# name_last string and then the email in Employees.__init__), only the bigger of the two shows up.
+# New message bytes per sign-off: The size of every brand-new message string the sign-offs created. Here we can count
+# the real total, because we keep every message we get back: each new string is a separate object, while the
+# flyweight's cached messages are the SAME object over and over, so we only count each object once. (This also leaves
+# out random.randrange(), which both classes call the same way.)
+
+first_names = ["John", "Jane", "Billy", "Molly", "Example"]
+last_names = ["Doe", "Smith", "Johnson", "Bob", "For"]
+languages = ["Python", "Java"]
+staff_strings = [f"{last_names[i % 5]}/{first_names[i // 5 % 5]}/{9000 + i % 100}/{languages[i % 2]}"
+                 for i in range(20000)]
+
+
+def measure(developer_class):
+    tracemalloc.start()
+
+    staff = []
+    build_peak = 0
+    for string in staff_strings:
+        # Splitting the string costs both classes the same, so we leave it out of the measurement
+        lastname, firstname, pay, language = string.split("/")
+        pay = int(pay)
+
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        developer = developer_class(lastname, firstname, pay, language)
+        build_peak += tracemalloc.get_traced_memory()[1] - before  # [1] is the peak since reset_peak()
+
+        staff.append(developer)
+        del developer, lastname, firstname, language  # So only the staff list keeps the strings alive
+    build_retained = tracemalloc.get_traced_memory()[0]  # How much memory the staff is using now
+
+    signoffs = [developer.review_signoff_request() for developer in staff]
+    new_messages = {id(message): message for message in signoffs}  # Same object --> same id --> counted once
+    signoff_new_bytes = sum(sys.getsizeof(message) for message in new_messages.values())
+
+    # Once we throw the messages away, the only memory that sticks around is whatever the class itself decided to keep
+    # (like the flyweight's signoff_messages cache).
+    del signoffs, new_messages
+    signoff_retained = tracemalloc.get_traced_memory()[0] - build_retained
+
+    tracemalloc.stop()
+    del staff
+
+    return build_retained, build_peak, signoff_retained, signoff_new_bytes
+
+
+regular = measure(DeveloperV2)
+flyweight = measure(FlyweightDeveloper)
+staff_size = len(staff_strings)
+
+print(f"\n{staff_size} developers, DeveloperV2 vs FlyweightDeveloper:"
+      f"\nRetained memory after building them: {regular[0]:,} vs {flyweight[0]:,} bytes"
+      f"\nPeak extra memory per developer built: {regular[1] // staff_size} vs {flyweight[1] // staff_size} bytes"
+      f"\nRetained memory after every sign-off: {regular[2]:,} vs {flyweight[2]:,} bytes"
+      f"\nNew message bytes per sign-off: {regular[3] / staff_size:.1f} vs {flyweight[3] / staff_size:.1f} bytes")
+
+# The flyweight version only holds a few int codes per developer, and the strings themselves live just once in the
+# StringTable. The trade-offs:
+# 1. Reading developer.email now builds a new string each time, so the flyweight is only worth it when we have many
+# instances and read their strings rarely.
+# 2. StringTable and signoff_messages only ever GROW. Even after every developer named "Smith" is gone, "Smith" (and
+# its sign-off messages) stay in the tables, while a regular DeveloperV2 would have freed them. With lots of different
+# names coming and going, the tables can end up holding more memory than they save.